@@ -2,21 +2,108 @@ import sys
 import os
 import json
 import shutil
+import errno
+import itertools
+import queue
+import threading
+import mmap
+import struct
+import re
+from collections import OrderedDict
+from array import array
 from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QProgressBar, 
                             QFileDialog, QMessageBox, QGroupBox, QGridLayout,
                             QDialog, QDialogButtonBox, QLineEdit, QFrame, QCheckBox)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtGui import QPixmap, QFont, QAction, QKeySequence, QShortcut, QIcon
-from PIL import Image
+from PyQt6.QtCore import (Qt, QObject, QThread, QMetaObject, Q_ARG, pyqtSignal, pyqtSlot,
+                          QTimer, QSize, QRect)
+from PyQt6.QtGui import (QPixmap, QImage, QPainter, QImageReader, QImageIOHandler, QFont,
+                         QAction, QKeySequence, QShortcut, QIcon)
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SUPPORTED_EXTENSIONS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp'})
+
+# Matched in C against the end of the name, no lowercased copy per file
+_EXTENSION_RE = re.compile(
+    r'\.(?:%s)\Z' % '|'.join(sorted(SUPPORTED_EXTENSIONS)),
+    re.IGNORECASE
+)
+
+MANIFEST_MAGIC = b'ISM1'
+
+# Linux ioctl that shares the source extents with the target (Btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+def _numbered_name(filename, counter):
+    if counter == 0:
+        return filename
+    name, ext = os.path.splitext(filename)
+    return f"{name}_{counter}{ext}"
+
+def _copy_file_data(src_f, dst_f):
+    # copy_file_range keeps the data in the kernel; whatever it could not
+    # copy (unsupported filesystem, other OS) is finished in user space
+    offset = 0
+    if hasattr(os, 'copy_file_range'):
+        remaining = os.fstat(src_f.fileno()).st_size
+        try:
+            while remaining:
+                copied = os.copy_file_range(src_f.fileno(), dst_f.fileno(), remaining, offset)
+                if copied == 0:
+                    break
+                remaining -= copied
+                offset += copied
+        except OSError:
+            pass
+    src_f.seek(offset)
+    shutil.copyfileobj(src_f, dst_f, 1024 * 1024)
+
+def _copy_or_link(src, target_folder, counter=0, allow_hardlink=False):
+    # Each candidate name is claimed atomically (link or O_EXCL create), so an
+    # existing file is never overwritten and no separate exists() probe is needed
+    filename = os.path.basename(src)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    for counter in itertools.count(counter):
+        dst = os.path.join(target_folder, _numbered_name(filename, counter))
+        if allow_hardlink:
+            try:
+                os.link(src, dst)
+                return dst
+            except FileExistsError:
+                continue
+            except OSError:
+                allow_hardlink = False
+        try:
+            fd = os.open(dst, flags, 0o644)
+            break
+        except FileExistsError:
+            continue
+            
+    try:
+        with os.fdopen(fd, 'wb') as dst_f, open(src, 'rb') as src_f:
+            try:
+                if fcntl is None:
+                    raise OSError(errno.EOPNOTSUPP, "reflink not available")
+                fcntl.ioctl(dst_f.fileno(), FICLONE, src_f.fileno())
+            except OSError:
+                _copy_file_data(src_f, dst_f)
+        shutil.copystat(src, dst)
+    except BaseException:
+        os.remove(dst)
+        raise
+    return dst
 
 class SettingsDialog(QDialog):
     def __init__(self, parent=None, current_settings=None):
         super().__init__(parent)
         self.setWindowTitle("Settings")
         self.setModal(True)
-        self.resize(500, 250)
+        self.resize(500, 300)
         
         self.current_settings = current_settings or {}
         self.setup_ui()
@@ -57,6 +144,17 @@ class SettingsDialog(QDialog):
         resume_group.setLayout(resume_layout)
         layout.addWidget(resume_group)
         
+        copy_group = QGroupBox("Copy Settings")
+        copy_layout = QVBoxLayout()
+        
+        self.use_hardlinks_cb = QCheckBox("Use hardlinks for kept images (saves disk space)")
+        self.use_hardlinks_cb.setToolTip("When source and target are on the same drive, kept images are linked instead of copied. Both names then share the same file content")
+        self.use_hardlinks_cb.setChecked(True)
+        copy_layout.addWidget(self.use_hardlinks_cb)
+        
+        copy_group.setLayout(copy_layout)
+        layout.addWidget(copy_group)
+        
         button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | 
                                      QDialogButtonBox.StandardButton.Cancel)
         button_box.accepted.connect(self.accept)
@@ -72,6 +170,8 @@ class SettingsDialog(QDialog):
             self.target_edit.setText(self.current_settings['target_folder'])
         if 'remember_position' in self.current_settings:
             self.remember_position_cb.setChecked(self.current_settings['remember_position'])
+        if 'use_hardlinks' in self.current_settings:
+            self.use_hardlinks_cb.setChecked(self.current_settings['use_hardlinks'])
             
     def browse_source(self):
         folder = QFileDialog.getExistingDirectory(self, "Select Source Folder")
@@ -87,63 +187,291 @@ class SettingsDialog(QDialog):
         return {
             'source_folder': self.source_edit.text(),
             'target_folder': self.target_edit.text(),
-            'remember_position': self.remember_position_cb.isChecked()
+            'remember_position': self.remember_position_cb.isChecked(),
+            'use_hardlinks': self.use_hardlinks_cb.isChecked()
         }
 
-class ImageLoaderThread(QThread):
-    imageLoaded = pyqtSignal(str, object)
+class LoaderWorker(QObject):
+    imageLoaded = pyqtSignal(str, object, bool)
     loadError = pyqtSignal(str, str)
     
-    def __init__(self, filepath):
+    def __init__(self):
         super().__init__()
-        self.filepath = filepath
+        # Paths the GUI still needs; queued requests for anything else are dropped
+        self._wanted = frozenset()
+        self._wanted_lock = threading.Lock()
         
-    def run(self):
+    def set_wanted(self, paths):
+        with self._wanted_lock:
+            self._wanted = frozenset(path for path in paths if path)
+            
+    @pyqtSlot(str, QSize)
+    def load(self, filepath, target_size):
+        with self._wanted_lock:
+            if filepath not in self._wanted:
+                return
         try:
-            with Image.open(self.filepath) as img:
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    img = img.convert('RGB')
-                
-                # Load the full resolution image for better scaling
-                temp_path = "temp_image.jpg"
-                img.save(temp_path, "JPEG", quality=95)
-                
-                pixmap = QPixmap(temp_path)
-                
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
+            reader = QImageReader(filepath)
+            reader.setAutoTransform(True)
+            
+            # Let the decoder downscale (libjpeg can decode at 1/2, 1/4, 1/8)
+            # instead of materializing the full resolution image
+            native_size = reader.size()
+            if target_size.isValid() and native_size.isValid():
+                target = QSize(target_size)
+                if reader.transformation() & QImageIOHandler.Transformation.TransformationRotate90:
+                    target.transpose()
+                if native_size.width() > target.width() or native_size.height() > target.height():
+                    reader.setScaledSize(native_size.scaled(target, Qt.AspectRatioMode.KeepAspectRatio))
+                    
+            image = reader.read()
+            
+            if image.isNull():
+                self.loadError.emit(filepath, reader.errorString())
+                return
                 
-                self.imageLoaded.emit(self.filepath, pixmap)
+            # QPixmap must be created in the GUI thread, so hand over the QImage
+            self.imageLoaded.emit(filepath, image, reader.scaledSize().isValid())
                 
         except Exception as e:
-            self.loadError.emit(self.filepath, str(e))
+            self.loadError.emit(filepath, str(e))
+
+def _walk_images(folder, skip=None):
+    # scandir hands back the entry type, so most entries need no extra stat call
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    # skip is the stat of a folder to leave out (the target folder)
+                    if (skip is not None and entry.inode() == skip.st_ino and
+                            entry.stat(follow_symlinks=False).st_dev == skip.st_dev):
+                        continue
+                    yield from _walk_images(entry.path, skip)
+                elif _EXTENSION_RE.search(entry.name) and entry.is_file():
+                    yield folder, entry.name
+    except OSError:
+        # Unreadable folders are skipped, like os.walk does
+        return
+
+class WalkerThread(QThread):
+    filesBatch = pyqtSignal(list)
+    walkerFinished = pyqtSignal()
+    
+    BATCH_SIZE = 500
+    
+    def __init__(self, source_folder, target_folder=None):
+        super().__init__()
+        self.source_folder = source_folder
+        self.target_folder = target_folder
+        
+    def run(self):
+        # Kept images are copied while the walk is still running, so a target
+        # folder inside the source tree must not be scanned
+        try:
+            skip = os.stat(self.target_folder) if self.target_folder else None
+        except OSError:
+            skip = None
+            
+        batch = []
+        for entry in _walk_images(self.source_folder, skip):
+            if self.isInterruptionRequested():
+                return
+            batch.append(entry)
+            if len(batch) >= self.BATCH_SIZE:
+                self.filesBatch.emit(batch)
+                batch = []
+        if batch:
+            self.filesBatch.emit(batch)
+        self.walkerFinished.emit()
+
+class CopyWorker(QThread):
+    copyFinished = pyqtSignal(str, str)
+    copyError = pyqtSignal(str, str)
+    
+    def __init__(self, copy_queue):
+        super().__init__()
+        self.copy_queue = copy_queue
+        
+    def run(self):
+        while True:
+            job = self.copy_queue.get()
+            if job is None:
+                break
+            source_file, target_folder, counter, use_hardlinks = job
+            target_file = ''
+            try:
+                allow_hardlink = (use_hardlinks and
+                                  os.stat(source_file).st_dev == os.stat(target_folder).st_dev)
+                target_file = _copy_or_link(source_file, target_folder, counter, allow_hardlink)
+            except Exception as e:
+                self.copyError.emit(source_file, str(e))
+            self.copyFinished.emit(source_file, target_file)
 
 class ScaledLabel(QLabel):
+    resizeSettled = pyqtSignal()
+    
     def __init__(self):
         super().__init__()
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setMinimumSize(400, 300)
         self.setStyleSheet("border: 1px solid gray; background-color: black;")
         self.setText("No image loaded")
-        self.original_pixmap = None
-        
-    def setPixmap(self, pixmap):
-        self.original_pixmap = pixmap
+        self.original_image = None
+        self._last_size = None
+        # Scaled frames are painted into one reusable buffer, which is only
+        # reallocated when the label grows past it
+        self._buf = None
+        
+        # During a drag a cheap nearest-neighbour preview is shown, the smooth
+        # rescale only runs once resizing has paused
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.timeout.connect(self._on_resize_settled)
+        
+    def setImage(self, image):
+        self.original_image = image
+        self._last_size = None
         self.updatePixmap()
         
     def updatePixmap(self):
-        if self.original_pixmap:
-            scaled_pixmap = self.original_pixmap.scaled(
-                self.size(), 
-                Qt.AspectRatioMode.KeepAspectRatio, 
-                Qt.TransformationMode.SmoothTransformation
-            )
-            super().setPixmap(scaled_pixmap)
+        if self.original_image is not None:
+            if self._last_size == self.size():
+                return
+            self._render(smooth=True)
+            self._last_size = self.size()
+            
+    def _on_resize_settled(self):
+        self.updatePixmap()
+        self.resizeSettled.emit()
+        
+    def _render(self, smooth):
+        size = self.contentsRect().size()
+        # The pixmap the label currently shows shares the old buffer's memory
+        # (see below), so that buffer must outlive the setPixmap call
+        old_buf = self._buf
+        if self._buf is None or self._buf.width() < size.width() or self._buf.height() < size.height():
+            buf_size = size if self._buf is None else size.expandedTo(self._buf.size())
+            self._buf = QImage(buf_size, QImage.Format.Format_RGB32)
+            
+        # Only the contents-sized corner of the buffer is painted and shown; the
+        # view shares the buffer's memory and keeps its row stride. With
+        # NoFormatConversion the raster backend does not copy it either, so the
+        # label's pixmap points into _buf and is repainted in place here, which
+        # is safe because nothing paints the label until setPixmap below
+        frame = QImage(self._buf.bits(), size.width(), size.height(),
+                       self._buf.bytesPerLine(), QImage.Format.Format_RGB32)
+        frame.fill(Qt.GlobalColor.black)
+        
+        target = self.original_image.size().scaled(size, Qt.AspectRatioMode.KeepAspectRatio)
+        rect = QRect((size.width() - target.width()) // 2,
+                     (size.height() - target.height()) // 2,
+                     target.width(), target.height())
+        painter = QPainter(frame)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform, smooth)
+        painter.drawImage(rect, self.original_image)
+        painter.end()
+        
+        super().setPixmap(QPixmap.fromImage(frame, Qt.ImageConversionFlag.NoFormatConversion))
+        del old_buf
     
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        if self.original_pixmap:
-            self.updatePixmap()
+        if self.original_image is not None:
+            self._last_size = None
+            self._render(smooth=False)
+            self._resize_timer.start(120)
+
+class ImageLRU:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._items = OrderedDict()
+        
+    def get(self, key, display_size=None):
+        item = self._items.get(key)
+        if item is None:
+            return None
+        image, _, reduced = item
+        # A reduced decode smaller than the display would have to be upscaled
+        if reduced and display_size is not None:
+            fitted = image.size().scaled(display_size, Qt.AspectRatioMode.KeepAspectRatio)
+            # One pixel of slack absorbs rounding between the decode and display sizes
+            if fitted.width() > image.width() + 1 or fitted.height() > image.height() + 1:
+                return None
+        self._items.move_to_end(key)
+        return image
+        
+    def put(self, key, image, reduced=False):
+        if key in self._items:
+            self.total_bytes -= self._items.pop(key)[1]
+        size = image.sizeInBytes()
+        self._items[key] = (image, size, reduced)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and len(self._items) > 1:
+            _, (_, evicted_size, _) = self._items.popitem(last=False)
+            self.total_bytes -= evicted_size
+            
+    def __contains__(self, key):
+        return key in self._items
+
+def _pack_str(text):
+    data = text.encode('utf-8')
+    return struct.pack('<I', len(data)) + data
+
+def _unpack_str(buffer, offset):
+    (length,) = struct.unpack_from('<I', buffer, offset)
+    offset += 4
+    return buffer[offset:offset + length].decode('utf-8'), offset + length
+
+# Image paths split into a table of unique folders and (folder index, filename)
+# columns, so the folder prefix is stored once instead of once per file
+class ImageList:
+    def __init__(self):
+        self.dirs = []
+        self.dir_indices = array('I')
+        self.names = []
+        self._dir_lookup = {}
+        
+    def add(self, folder, name):
+        index = self._dir_lookup.get(folder)
+        if index is None:
+            index = self._dir_lookup[folder] = len(self.dirs)
+            self.dirs.append(folder)
+        self.dir_indices.append(index)
+        self.names.append(name)
+        
+    def __len__(self):
+        return len(self.names)
+        
+    def __getitem__(self, index):
+        return os.path.join(self.dirs[self.dir_indices[index]], self.names[index])
+        
+    def pack(self):
+        parts = [struct.pack('<I', len(self.dirs))]
+        parts.extend(_pack_str(folder) for folder in self.dirs)
+        parts.append(struct.pack('<I', len(self.names)))
+        parts.append(struct.pack('<%dI' % len(self.dir_indices), *self.dir_indices))
+        parts.extend(_pack_str(name) for name in self.names)
+        return b''.join(parts)
+        
+    @classmethod
+    def unpack(cls, buffer, offset=0):
+        image_list = cls()
+        (dir_count,) = struct.unpack_from('<I', buffer, offset)
+        offset += 4
+        for _ in range(dir_count):
+            folder, offset = _unpack_str(buffer, offset)
+            image_list.dirs.append(folder)
+        image_list._dir_lookup = {folder: i for i, folder in enumerate(image_list.dirs)}
+        
+        (count,) = struct.unpack_from('<I', buffer, offset)
+        offset += 4
+        image_list.dir_indices.extend(struct.unpack_from('<%dI' % count, buffer, offset))
+        offset += 4 * count
+        for _ in range(count):
+            name, offset = _unpack_str(buffer, offset)
+            image_list.names.append(name)
+        return image_list, offset
 
 class ImageSorterApp(QMainWindow):
     def __init__(self):
@@ -156,16 +484,45 @@ class ImageSorterApp(QMainWindow):
             self.setWindowIcon(QIcon("assets/logo/icon.ico"))
         
         self.settings_file = "settings.json"
-        self.session_file = "session.json"
-        
-        self.image_files = []
+        # The file list is written once per session, only the position changes per image
+        self.manifest_file = "session_manifest.bin"
+        self.state_file = "session_state.json"
+        self._manifest_saved = False
+        self._ui_dirty = False
+        self._walker = None
+        self._scanning = False
+        self._waiting_for_files = False
+        
+        self.image_files = ImageList()
+        self._total_str = "0"
+        self._inv_total = 0.0
         self.current_index = 0
         self.processed_count = 0
         self.kept_count = 0
         self.current_image_path = None
-        self.image_loader_thread = None
-        
-        self.supported_formats = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp')
+        self._target_names = set()
+        
+        # A single loader thread serves every request, including the prefetch
+        self._loader_thread = QThread()
+        self._worker = LoaderWorker()
+        self._worker.moveToThread(self._loader_thread)
+        self._worker.imageLoaded.connect(self.on_image_loaded)
+        self._worker.loadError.connect(self.on_image_load_error)
+        self._loader_thread.start()
+        
+        # Kept images are copied in the background so the UI never waits on the disk
+        self._copy_queue = queue.Queue()
+        self._pending_copies = 0
+        self._copy_worker = CopyWorker(self._copy_queue)
+        self._copy_worker.copyFinished.connect(self.on_copy_finished)
+        self._copy_worker.copyError.connect(self.on_copy_error)
+        self._copy_worker.start()
+        
+        # Recently decoded images, so prefetched or revisited images skip the decoder
+        self._image_cache = ImageLRU(256 * 1024 * 1024)
+        
+        # One-slot look-ahead: the next image is decoded while the current one is shown
+        self._prefetch_path = None
         
         self.settings = self.load_settings()
         
@@ -267,6 +624,7 @@ class ImageSorterApp(QMainWindow):
         
         # Use custom scaling label with black background
         self.image_label = ScaledLabel()
+        self.image_label.resizeSettled.connect(self.on_label_resize_settled)
         self.image_label.setText("No image loaded")
         image_layout.addWidget(self.image_label, 1)  # Stretch factor 1 to take available space
         
@@ -329,40 +687,86 @@ class ImageSorterApp(QMainWindow):
             
     def load_session(self):
         try:
-            if os.path.exists(self.session_file):
-                with open(self.session_file, 'r') as f:
-                    return json.load(f)
+            if os.path.exists(self.manifest_file) and os.path.exists(self.state_file):
+                session_data = self.load_manifest()
+                with open(self.state_file, 'r') as f:
+                    session_data.update(json.load(f))
+                session_data['total_files'] = len(session_data['image_files'])
+                return session_data
         except Exception as e:
             print(f"Error loading session: {e}")
         return {}
         
-    def save_session(self):
+    def load_manifest(self):
+        # Mapped read-only and decoded straight from the buffer, no JSON parsing
+        with open(self.manifest_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                if buffer[:4] != MANIFEST_MAGIC:
+                    raise ValueError("unknown session manifest format")
+                source_folder, offset = _unpack_str(buffer, 4)
+                target_folder, offset = _unpack_str(buffer, offset)
+                image_files, offset = ImageList.unpack(buffer, offset)
+        return {
+            'source_folder': source_folder,
+            'target_folder': target_folder,
+            'image_files': image_files
+        }
+        
+    def _write_file_atomic(self, path, data):
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        
+    def save_manifest(self):
         if not self.settings.get('remember_position', False):
             return
             
         try:
-            session_data = {
-                'source_folder': self.settings.get('source_folder'),
-                'target_folder': self.settings.get('target_folder'),
+            manifest_data = b''.join((
+                MANIFEST_MAGIC,
+                _pack_str(self.settings.get('source_folder') or ''),
+                _pack_str(self.settings.get('target_folder') or ''),
+                self.image_files.pack()
+            ))
+            self._write_file_atomic(self.manifest_file, manifest_data)
+            self._manifest_saved = True
+        except Exception as e:
+            print(f"Error saving session manifest: {e}")
+        
+    def save_session(self):
+        self.schedule_ui_flush()
+        
+    def _write_session_state(self):
+        if not self.settings.get('remember_position', False) or self._scanning:
+            return
+        if not self._manifest_saved:
+            self.save_manifest()
+            
+        try:
+            state_data = {
                 'current_index': self.current_index,
                 'processed_count': self.processed_count,
-                'kept_count': self.kept_count,
-                'total_files': len(self.image_files) if self.image_files else 0,
-                'image_files': self.image_files
+                'kept_count': self.kept_count
             }
-            with open(self.session_file, 'w') as f:
-                json.dump(session_data, f, indent=2)
+            self._write_file_atomic(self.state_file, json.dumps(state_data, separators=(',', ':')).encode('utf-8'))
         except Exception as e:
             print(f"Error saving session: {e}")
             
     def reset_session(self):
+        self.discard_prefetch()
+        self._manifest_saved = False
         try:
-            if os.path.exists(self.session_file):
-                os.remove(self.session_file)
+            self._remove_session_files()
             QMessageBox.information(self, "Session Reset", "Session data has been cleared.")
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Could not reset session: {e}")
             
+    def _remove_session_files(self):
+        for path in (self.manifest_file, self.state_file):
+            if os.path.exists(path):
+                os.remove(path)
+                
     def check_for_resume(self):
         if not self.settings.get('remember_position', False):
             return
@@ -398,20 +802,21 @@ class ImageSorterApp(QMainWindow):
                 self.resume_session(session_data)
                 
     def resume_session(self, session_data):
+        self.discard_prefetch()
         try:
-            self.image_files = session_data.get('image_files', [])
+            self.image_files = session_data.get('image_files', ImageList())
             self.current_index = session_data.get('current_index', 0)
             self.processed_count = session_data.get('processed_count', 0)
             self.kept_count = session_data.get('kept_count', 0)
+            self._manifest_saved = True
+            self.cache_target_names()
             
             if self.image_files and self.current_index < len(self.image_files):
-                self.progress_bar.setMaximum(len(self.image_files))
+                self.set_total_files()
                 self.progress_bar.setValue(self.current_index)
                 
                 self.start_btn.setEnabled(False)
-                self.thumbs_up_btn.setEnabled(True)
-                self.thumbs_down_btn.setEnabled(True)
-                self.skip_btn.setEnabled(True)
+                self.set_action_buttons_enabled(True)
                 
                 self.load_current_image()
             else:
@@ -438,7 +843,8 @@ class ImageSorterApp(QMainWindow):
     def can_start_sorting(self):
         source_folder = self.settings.get('source_folder', '')
         target_folder = self.settings.get('target_folder', '')
-        return bool(source_folder and target_folder and os.path.exists(source_folder))
+        return bool(source_folder and target_folder and os.path.exists(source_folder)
+                    and not self._scanning)
                 
     def start_sorting(self):
         source_folder = self.settings.get('source_folder')
@@ -458,67 +864,214 @@ class ImageSorterApp(QMainWindow):
             QMessageBox.critical(self, "Error", f"Could not create target folder: {e}")
             return
             
-        self.find_image_files()
+        self.cache_target_names()
         
-        if not self.image_files:
-            QMessageBox.information(self, "Info", "No image files found in the source folder.")
-            return
-            
+        # Nothing is saved until the walk finishes, so an older session must not
+        # survive to be offered again if the app closes before that
+        if self.settings.get('remember_position', False):
+            try:
+                self._remove_session_files()
+            except OSError as e:
+                print(f"Error removing old session: {e}")
+                
+        self.stop_walker()
+        self.image_files = ImageList()
         self.current_index = 0
         self.processed_count = 0
         self.kept_count = 0
+        self.current_image_path = None
+        self._manifest_saved = False
+        self.discard_prefetch()
         
-        self.progress_bar.setMaximum(len(self.image_files))
+        self.set_total_files()
         self.progress_bar.setValue(0)
-        
         self.start_btn.setEnabled(False)
-        self.thumbs_up_btn.setEnabled(True)
-        self.thumbs_down_btn.setEnabled(True)
-        self.skip_btn.setEnabled(True)
+        self.status_label.setText("Scanning for images...")
+        
+        # Sorting starts with the first batch while the rest of the tree is still walked
+        self._scanning = True
+        self._waiting_for_files = True
+        self._walker = WalkerThread(source_folder, target_folder)
+        self._walker.filesBatch.connect(self.on_files_batch)
+        self._walker.walkerFinished.connect(self.on_walker_finished)
+        self._walker.start()
+        
+    def stop_walker(self):
+        if self._walker is None:
+            return
+        self._walker.requestInterruption()
+        self._walker.wait()
+        self._walker.filesBatch.disconnect()
+        self._walker.walkerFinished.disconnect()
+        self._walker = None
+        
+    def on_files_batch(self, batch):
+        # Batches still queued from a walker that was replaced are ignored
+        if self.sender() is not self._walker:
+            return
+        for folder, name in batch:
+            self.image_files.add(folder, name)
+        self.set_total_files()
+        
+        if self._waiting_for_files:
+            self._waiting_for_files = False
+            self.set_action_buttons_enabled(True)
+            self.load_current_image()
+        else:
+            self.start_prefetch()
+            self.update_progress()
+            
+    def on_walker_finished(self):
+        if self.sender() is not self._walker:
+            return
+        self._scanning = False
         
-        self.load_current_image()
+        if not self.image_files:
+            self._waiting_for_files = False
+            self.start_btn.setEnabled(True)
+            self.status_label.setText("Ready to start")
+            QMessageBox.information(self, "Info", "No image files found in the source folder.")
+            return
+            
+        # The manifest is written once, now that the file list is complete
+        self.save_manifest()
+        self.save_session()
         
-    def find_image_files(self):
-        self.image_files = []
-        source_folder = self.settings.get('source_folder')
+        if self._waiting_for_files:
+            self._waiting_for_files = False
+            self.load_current_image()
+            
+    def set_action_buttons_enabled(self, enabled):
+        self.thumbs_up_btn.setEnabled(enabled)
+        self.thumbs_down_btn.setEnabled(enabled)
+        self.skip_btn.setEnabled(enabled)
         
-        for root, dirs, files in os.walk(source_folder):
-            for file in files:
-                if file.lower().endswith(self.supported_formats):
-                    self.image_files.append(os.path.join(root, file))
-                    
-        self.status_label.setText(f"Found {len(self.image_files)} image files")
+    def cache_target_names(self):
+        # Name collisions are resolved against this set instead of probing the disk
+        try:
+            names = os.listdir(self.settings.get('target_folder'))
+        except OSError:
+            names = []
+        self._target_names = {os.path.normcase(name) for name in names}
         
     def load_current_image(self):
         if self.current_index >= len(self.image_files):
+            if self._scanning:
+                # Caught up with the walker, on_files_batch resumes from here
+                self._waiting_for_files = True
+                self.current_image_path = None
+                self.update_wanted()
+                self.set_action_buttons_enabled(False)
+                self.image_label.setText("Scanning for more images...")
+                self.filename_label.setText("")
+                return
             self.sorting_complete()
             return
             
         self.current_image_path = self.image_files[self.current_index]
         self.filename_label.setText(os.path.basename(self.current_image_path))
-        
-        self.image_label.setText("Loading image...")
-        
-        self.image_loader_thread = ImageLoaderThread(self.current_image_path)
-        self.image_loader_thread.imageLoaded.connect(self.on_image_loaded)
-        self.image_loader_thread.loadError.connect(self.on_image_load_error)
-        self.image_loader_thread.start()
+        # A pending prefetch for an image that was skipped past is no longer needed
+        if self._prefetch_path != self.current_image_path:
+            self._prefetch_path = None
+        self.update_wanted()
+        
+        image = self._image_cache.get(self.current_image_path, self.display_size())
+        if image is not None:
+            self.show_image(image)
+        elif self._prefetch_path == self.current_image_path:
+            # The prefetch is already queued for this image, on_image_loaded will show it
+            self.image_label.setText("Loading image...")
+        else:
+            self.image_label.setText("Loading image...")
+            self.request_image(self.current_image_path)
         
         self.update_progress()
         self.save_session()
         
-    def on_image_loaded(self, filepath, pixmap):
+    def display_size(self):
+        ratio = self.image_label.devicePixelRatioF()
+        size = self.image_label.size()
+        return QSize(round(size.width() * ratio), round(size.height() * ratio))
+        
+    def request_image(self, filepath):
+        QMetaObject.invokeMethod(self._worker, "load", Qt.ConnectionType.QueuedConnection,
+                                 Q_ARG(str, filepath), Q_ARG(QSize, self.display_size()))
+        
+    def on_label_resize_settled(self):
+        # The shown image was decoded for a smaller label, decode it again at the new size
+        path = self.current_image_path
+        if path and path in self._image_cache and self._image_cache.get(path, self.display_size()) is None:
+            self.request_image(path)
+            
+    def update_wanted(self):
+        self._worker.set_wanted((self.current_image_path, self._prefetch_path))
+        
+    def on_image_loaded(self, filepath, image, reduced):
+        # Even a decode that is no longer needed is kept, in case the image comes back
+        self._image_cache.put(filepath, image, reduced)
+        if filepath == self._prefetch_path:
+            self._prefetch_path = None
         if filepath == self.current_image_path:
-            self.image_label.setPixmap(pixmap)
+            self.show_image(image)
+            
+    def show_image(self, image):
+        self.image_label.setImage(image)
+        self.start_prefetch()
+        
+    def start_prefetch(self):
+        next_index = self.current_index + 1
+        if next_index >= len(self.image_files):
+            return
+            
+        next_path = self.image_files[next_index]
+        if (next_path == self._prefetch_path or
+                self._image_cache.get(next_path, self.display_size()) is not None):
+            return
+            
+        self._prefetch_path = next_path
+        self.update_wanted()
+        self.request_image(next_path)
+        
+    def discard_prefetch(self):
+        self._prefetch_path = None
+        self.update_wanted()
             
     def on_image_load_error(self, filepath, error_msg):
         if filepath == self.current_image_path:
             self.image_label.setText(f"Error loading image:\n{error_msg}")
+            self.start_prefetch()
+        elif filepath == self._prefetch_path:
+            # Forget the failed prefetch so the image is requested (and reported) again
+            self._prefetch_path = None
             
     def update_progress(self):
-        progress_text = f"Image {self.current_index + 1} of {len(self.image_files)}"
-        percentage = ((self.current_index + 1) / len(self.image_files)) * 100
-        progress_text += f" ({percentage:.1f}%)"
+        self.schedule_ui_flush()
+        
+    def schedule_ui_flush(self):
+        # Rapid key presses collapse into one label refresh and one session write
+        if not self._ui_dirty:
+            self._ui_dirty = True
+            QTimer.singleShot(0, self._flush_ui)
+            
+    def _flush_ui(self):
+        if not self._ui_dirty:
+            return
+        self._ui_dirty = False
+        self._refresh_progress()
+        self._write_session_state()
+        
+    def set_total_files(self):
+        # The total only changes per session, so its text and reciprocal are cached
+        total = len(self.image_files)
+        self._total_str = str(total)
+        self._inv_total = 100.0 / total if total else 0.0
+        self.progress_bar.setMaximum(total)
+        
+    def _refresh_progress(self):
+        position = min(self.current_index + 1, len(self.image_files))
+        progress_text = "Image %d of %s (%.1f%%)" % (position, self._total_str, position * self._inv_total)
+        if self._pending_copies:
+            progress_text += f" | Pending copies: {self._pending_copies}"
         self.status_label.setText(progress_text)
         
         stats_text = f"Processed: {self.processed_count} | Kept: {self.kept_count}"
@@ -527,7 +1080,7 @@ class ImageSorterApp(QMainWindow):
             stats_text += f" ({keep_percentage:.1f}%)"
         self.stats_label.setText(stats_text)
         
-        self.progress_bar.setValue(self.current_index + 1)
+        self.progress_bar.setValue(position)
         
     def thumbs_up(self):
         if not self.thumbs_up_btn.isEnabled():
@@ -561,25 +1114,36 @@ class ImageSorterApp(QMainWindow):
             source_file = self.current_image_path
             filename = os.path.basename(source_file)
             target_folder = self.settings.get('target_folder')
-            target_file = os.path.join(target_folder, filename)
-            
-            if os.path.exists(target_file):
-                name, ext = os.path.splitext(filename)
-                counter = 1
-                while os.path.exists(target_file):
-                    new_filename = f"{name}_{counter}{ext}"
-                    target_file = os.path.join(target_folder, new_filename)
-                    counter += 1
-                    
-            shutil.copy2(source_file, target_file)
+            
+            # Start at the first name not known to be taken, the worker claims it
+            # on disk and moves on if another program took it meanwhile
+            counter = 0
+            while os.path.normcase(_numbered_name(filename, counter)) in self._target_names:
+                counter += 1
+                
+            self._target_names.add(os.path.normcase(_numbered_name(filename, counter)))
+            self._pending_copies += 1
+            self._copy_queue.put((source_file, target_folder, counter,
+                                  self.settings.get('use_hardlinks', True)))
             
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error copying file: {e}")
             
+    def on_copy_finished(self, source_file, target_file):
+        self._pending_copies -= 1
+        if target_file:
+            self._target_names.add(os.path.normcase(os.path.basename(target_file)))
+        if self.image_files:
+            self._refresh_progress()
+            
+    def on_copy_error(self, source_file, error_msg):
+        QMessageBox.critical(self, "Error", f"Error copying file: {error_msg}")
+            
     def sorting_complete(self):
-        self.thumbs_up_btn.setEnabled(False)
-        self.thumbs_down_btn.setEnabled(False)
-        self.skip_btn.setEnabled(False)
+        self.update_progress()
+        self._flush_ui()
+        
+        self.set_action_buttons_enabled(False)
         self.start_btn.setEnabled(True)
         
         self.image_label.setText("Sorting Complete!")
@@ -597,15 +1161,30 @@ class ImageSorterApp(QMainWindow):
             self.reset_session()
         
     def closeEvent(self, event):
-        if self.image_loader_thread and self.image_loader_thread.isRunning():
-            self.image_loader_thread.quit()
-            self.image_loader_thread.wait()
+        self.stop_walker()
+        self._flush_ui()
+        self._loader_thread.quit()
+        self._loader_thread.wait()
+        # Let queued copies finish before exiting
+        self._copy_queue.put(None)
+        self._copy_worker.wait()
         event.accept()
 
+def check_image_formats():
+    available = {bytes(fmt).decode().lower() for fmt in QImageReader.supportedImageFormats()}
+    missing = sorted(SUPPORTED_EXTENSIONS - available)
+    if missing:
+        print(f"Warning: no Qt image plugin for: {', '.join(missing)}")
+
 def main():
     app = QApplication(sys.argv)
     app.setApplicationName("Image Sorter")
     
+    # Large photos exceed Qt's default 128 MB decode limit (Qt 6.2+)
+    if hasattr(QImageReader, 'setAllocationLimit'):
+        QImageReader.setAllocationLimit(0)
+    check_image_formats()
+    
     # Set application icon for taskbar
     if os.path.exists("assets/logo/icon.ico"):
         app.setWindowIcon(QIcon("assets/logo/icon.ico"))